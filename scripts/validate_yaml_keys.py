@@ -10,44 +10,170 @@ This script:
 5. For each open PR, analyzes YAML changes and posts a summary comment
 """
 
+import gc
 import os
+import re
 import sys
 import yaml
 import json
+import hashlib
+import pickle
+import subprocess
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Tuple, Set, Any
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
+from typing import BinaryIO, DefaultDict, Dict, List, Optional, Tuple, Set, Any, Union
+from urllib.parse import quote
 
+# Prefer the libyaml-backed loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
-def extract_keys(data: Any, prefix: str = '') -> Dict[str, int]:
+# Prefer orjson for decoding API responses; fall back to the standard library
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Directories pruned anywhere in the tree while scanning
+EXCLUDED_DIRS = frozenset({'.git'})
+
+# Paths (relative, '/'-separated) that are never validated
+EXCLUDED_PATH_RE = re.compile(r'(?:^|/)(?:\.git|\.github/workflows)(?:/|$)')
+
+# Parsed YAML is cached on disk by content hash so unchanged files are not re-parsed.
+# The cache only lives outside the checkout, in a directory named by the
+# environment (CI points it at the runner's temp dir); without it the disk
+# layer is off. Entries are kept per PyYAML version and loader.
+_parse_cache_root = os.environ.get('YAML_PARSE_CACHE_DIR', '')
+PARSE_CACHE_ROOT = Path(_parse_cache_root) if _parse_cache_root else None
+PARSE_CACHE_DIR = (
+    PARSE_CACHE_ROOT / f'pyyaml-{yaml.__version__}-{SafeLoader.__name__}'
+    if PARSE_CACHE_ROOT else None
+)
+_new_content_hash = partial(hashlib.blake2b, digest_size=16)
+
+# In-process layer of the parse cache, keyed by content digest and
+# bounded to the most recently used entries
+PARSED_MEMO_SIZE = 512
+_PARSED: 'OrderedDict[str, Tuple[List[Any], List[str]]]' = OrderedDict()
+
+# Concurrent downloads of PR file contents
+MAX_FETCH_WORKERS = 16
+
+# Concurrent comment updates; kept low to stay clear of GitHub's secondary rate limits
+MAX_COMMENT_WORKERS = 4
+
+# First line of every validation comment, used to find the one from a previous run
+COMMENT_MARKER = "## YAML Validation Report"
+
+# Shared HTTP session so keep-alive connections are reused across threads.
+# Idempotent requests are retried with backoff on transient server errors.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504],
+        respect_retry_after_header=True
+    )
+))
+
+
+# Stack entry marking that a container's subtree has been fully walked
+_EXIT = object()
+
+# Reported for files whose aliases make a container include itself
+SELF_REFERENCE_ERROR = "YAML structure error: an alias refers to a node that contains it; that branch was skipped"
+
+
+def extract_keys_into(data: Any, out: Dict[Tuple, int]) -> int:
     """
-    Extract all keys from a YAML structure in dot-notation.
-    For lists, use prefix[] notation and count each occurrence.
-    Returns a dict mapping key paths to their count.
+    Extract all keys from a YAML structure.
+    Counts are accumulated into `out`, which must be a defaultdict(int).
+    Paths are tuples of interned key segments; a trailing None marks a list.
+    Use join_key_paths() to turn them into dot-notation strings.
+    Walks the structure with an explicit stack instead of recursion.
+    Scalars and empty dicts contribute no keys of their own, so they are
+    never pushed; empty lists still are, since they count as prefix[].
+    Aliases can make a container include itself (`a: &x [*x]`); such a
+    container is not descended into again while it is being walked.
+    Returns the number of self-references skipped.
+    """
+    intern = sys.intern
+    stack = [(data, ())]
+    push = stack.append
+    pop = stack.pop
+    
+    # Containers on the path from the root to the node being walked
+    on_path = set()
+    self_references = 0
+    
+    # The safe loader builds plain dicts and lists, never subclasses, so
+    # exact type checks are enough
+    while stack:
+        node, prefix = pop()
+        
+        if node is _EXIT:
+            on_path.discard(prefix)
+            continue
+        
+        node_type = type(node)
+        if node_type is not dict and node_type is not list:
+            continue
+        
+        node_id = id(node)
+        if node_id in on_path:
+            self_references += 1
+            continue
+        
+        # Children are pushed on top, so they finish before this marker pops
+        on_path.add(node_id)
+        push((_EXIT, node_id))
+        
+        if node_type is dict:
+            for key, value in node.items():
+                current_path = prefix + (intern(str(key)),)
+                out[current_path] += 1
+                value_type = type(value)
+                if value_type is list or (value_type is dict and value):
+                    push((value, current_path))
+        
+        else:
+            # Mark that this path is a list
+            out[prefix + (None,)] += 1
+            
+            # List elements share the list's prefix
+            for item in node:
+                item_type = type(item)
+                if item_type is list or (item_type is dict and item):
+                    push((item, prefix))
+    
+    return self_references
+
+
+def join_key_paths(path_counts: Dict[Tuple, int]) -> DefaultDict[str, int]:
+    """
+    Convert tuple paths from extract_keys_into() to dot-notation keys.
+    Lists use prefix[] notation.
     """
     key_counts = defaultdict(int)
     
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            key_counts[current_path] += 1
-            
-            # Recursively process nested structures
-            nested_counts = extract_keys(value, current_path)
-            for nested_key, count in nested_counts.items():
-                key_counts[nested_key] += count
-    
-    elif isinstance(data, list):
-        # Mark that this path is a list
-        list_path = f"{prefix}[]" if prefix else "[]"
-        key_counts[list_path] += 1
-        
-        # Process each list element
-        for item in data:
-            nested_counts = extract_keys(item, prefix)
-            for nested_key, count in nested_counts.items():
-                key_counts[nested_key] += count
+    for path, count in path_counts.items():
+        if path[-1] is None:
+            key_counts['.'.join(path[:-1]) + '[]'] += count
+        else:
+            key_counts['.'.join(path)] += count
     
     return key_counts
 
@@ -55,79 +181,243 @@ def extract_keys(data: Any, prefix: str = '') -> Dict[str, int]:
 def find_yaml_files(root_dir: str) -> List[Path]:
     """
     Find all YAML files in the repository, excluding .git and .github/workflows.
+    Excluded directories are pruned during a single walk of the tree.
     """
     yaml_files = []
-    root_path = Path(root_dir)
     
-    for pattern in ['**/*.yml', '**/*.yaml']:
-        for file_path in root_path.glob(pattern):
-            # Skip .git directory
-            if '.git' in file_path.parts:
+    for dir_path, dir_names, file_names in os.walk(root_dir):
+        # Skip .git directories
+        dir_names[:] = [d for d in dir_names if d not in EXCLUDED_DIRS]
+        
+        # Skip .github/workflows directory
+        if os.path.basename(dir_path) == '.github':
+            dir_names[:] = [d for d in dir_names if d != 'workflows']
+        
+        relative_dir = Path(os.path.relpath(dir_path, root_dir)).as_posix()
+        for file_name in file_names:
+            if not file_name.endswith(('.yml', '.yaml')):
                 continue
             
-            # Skip .github/workflows directory
-            if '.github' in file_path.parts and 'workflows' in file_path.parts:
+            # Pruning covers the normal case; this also catches odd layouts
+            if EXCLUDED_PATH_RE.search(f'{relative_dir}/{file_name}'):
                 continue
             
-            yaml_files.append(file_path)
+            yaml_files.append(Path(dir_path, file_name))
     
     return sorted(yaml_files)
 
 
-def parse_yaml_file(file_path: Path) -> Tuple[List[Any], List[str]]:
+def parse_yaml_content(source: Union[bytes, BinaryIO]) -> Tuple[List[Any], List[str]]:
     """
-    Parse a YAML file using safe_load_all.
+    Parse all documents in YAML bytes or a binary stream with the safe loader
+    (libyaml-backed when available). Streams are read in chunks by the parser.
     Returns (list of documents, list of error messages).
     """
     documents = []
     errors = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Try to parse all documents in the file
+        for doc in yaml.load_all(source, Loader=SafeLoader):
+            if doc is not None:
+                documents.append(doc)
+    except yaml.YAMLError as e:
+        errors.append(f"YAML parse error: {str(e)}")
+    
+    return documents, errors
+
+
+def _load_cached(digest: str, source: Union[bytes, BinaryIO]) -> Tuple[List[Any], List[str]]:
+    """
+    Parse YAML content, reusing a previous result for the same content digest.
+    Results are memoised in-process and pickled under PARSE_CACHE_DIR.
+    `source` is only read on a cache miss.
+    Parses with errors are never cached: their messages name the stream they
+    were read from, which identical content elsewhere does not share.
+    The returned lists are shared between callers and must not be mutated.
+    """
+    result = _PARSED.get(digest)
+    if result is not None:
+        _PARSED.move_to_end(digest)
+        return result
+    
+    if PARSE_CACHE_DIR is None:
+        result = parse_yaml_content(source)
+        if not result[1]:
+            _remember_parsed(digest, result)
+        return result
+    
+    cache_file = PARSE_CACHE_DIR / f'{digest}.pkl'
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            result = pickle.load(f)
+        # Mark the entry as used so prune_parse_cache() keeps it
+        os.utime(cache_file)
+    except Exception:
+        # Missing or unreadable cache entry: parse from scratch
+        result = None
+    
+    if result is None:
+        result = parse_yaml_content(source)
+        if result[1]:
+            return result
+        
+        try:
+            PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write under a per-process name so concurrent workers never see a partial file
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            print(f"⚠️  Could not write parse cache: {e}")
+    
+    _remember_parsed(digest, result)
+    return result
+
+
+def _remember_parsed(digest: str, result: Tuple[List[Any], List[str]]):
+    """
+    Add a parse result to the bounded in-process memo.
+    """
+    _PARSED[digest] = result
+    if len(_PARSED) > PARSED_MEMO_SIZE:
+        _PARSED.popitem(last=False)
+
+
+def prune_parse_cache(since: float):
+    """
+    Delete on-disk parse cache entries not used since `since`, including those
+    left behind by other PyYAML versions or loaders, so the saved cache only
+    holds what the current tree and open PRs need.
+    """
+    if PARSE_CACHE_ROOT is None or not PARSE_CACHE_ROOT.is_dir():
+        return
+    
+    removed = 0
+    for cache_dir in PARSE_CACHE_ROOT.iterdir():
+        if not cache_dir.is_dir():
+            continue
+        
+        for cache_file in cache_dir.iterdir():
+            try:
+                if cache_file.stat().st_mtime < since:
+                    cache_file.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        
         try:
-            for doc in yaml.safe_load_all(content):
-                if doc is not None:
-                    documents.append(doc)
-        except yaml.YAMLError as e:
-            errors.append(f"YAML parse error: {str(e)}")
+            cache_dir.rmdir()
+        except OSError:
+            # Still holds live entries
+            pass
     
+    if removed:
+        print(f"🧹 Pruned {removed} unused parse cache entries")
+
+
+def parse_yaml_content_cached(content: bytes) -> Tuple[List[Any], List[str]]:
+    """
+    Parse YAML bytes through the content-hash parse cache.
+    Returns (list of documents, list of error messages).
+    """
+    digest = _new_content_hash(content).hexdigest()
+    return _load_cached(digest, content)
+
+
+def _file_content_digest(f: BinaryIO) -> str:
+    """
+    Hash an open binary file with the parse cache's content hash.
+    Uses hashlib.file_digest on Python 3.11+ and chunked reads before that.
+    """
+    if hasattr(hashlib, 'file_digest'):
+        return hashlib.file_digest(f, _new_content_hash).hexdigest()
+    
+    content_hash = _new_content_hash()
+    for chunk in iter(partial(f.read, 1 << 16), b''):
+        content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def parse_yaml_file(file_path: Path) -> Tuple[List[Any], List[str]]:
+    """
+    Parse a YAML file through the content-hash parse cache.
+    The file is hashed and, on a cache miss, parsed straight from the handle
+    without materialising its contents.
+    Returns (list of documents, list of error messages).
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            digest = _file_content_digest(f)
+            f.seek(0)
+            return _load_cached(digest, f)
     except Exception as e:
-        errors.append(f"File read error: {str(e)}")
+        return [], [f"File read error: {str(e)}"]
+
+
+def _scan_one(path_str: str, root_dir: str) -> Tuple[str, DefaultDict[Tuple, int], int, List[str]]:
+    """
+    Parse a single YAML file and extract its keys.
+    Runs in a worker process, so it must stay a picklable top-level function.
+    Returns (relative_path, path_counts, document_count, errors), with
+    key paths still in extract_keys_into() tuple form.
+    """
+    file_path = Path(path_str)
+    relative_path = str(file_path.relative_to(root_dir))
+    documents, errors = parse_yaml_file(file_path)
     
-    return documents, errors
+    key_counts = defaultdict(int)
+    self_references = 0
+    for doc in documents:
+        self_references += extract_keys_into(doc, key_counts)
+    
+    if self_references:
+        # Cached error lists are shared, so build a new one
+        errors = errors + [SELF_REFERENCE_ERROR]
+    
+    return relative_path, key_counts, len(documents), errors
 
 
-def scan_repository(root_dir: str) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+def scan_repository(root_dir: str) -> Tuple[DefaultDict[str, int], Dict[str, List[str]]]:
     """
     Scan all YAML files in the repository.
+    Files are parsed in parallel worker processes and merged here.
     Returns (key_counts, file_errors).
     """
     yaml_files = find_yaml_files(root_dir)
     print(f"Found {len(yaml_files)} YAML files to scan")
     
-    all_key_counts = defaultdict(int)
+    all_path_counts = defaultdict(int)
     file_errors = {}
     
-    for file_path in yaml_files:
-        relative_path = str(file_path.relative_to(root_dir))
-        documents, errors = parse_yaml_file(file_path)
-        
-        if errors:
-            file_errors[relative_path] = errors
-            print(f"❌ {relative_path}: {len(errors)} error(s)")
-        else:
-            print(f"✅ {relative_path}: {len(documents)} document(s)")
-        
-        # Extract keys from all documents
-        for doc in documents:
-            key_counts = extract_keys(doc)
-            for key, count in key_counts.items():
-                all_key_counts[key] += count
+    paths = [str(file_path) for file_path in yaml_files]
     
-    return dict(all_key_counts), file_errors
+    # The scan allocates many short-lived containers and almost none form
+    # cycles (only self-referencing YAML aliases do). Pause the cyclic
+    # collector here and in the workers; anything it would have found is
+    # reclaimed by the single collection afterwards or when the workers exit
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=gc.disable) as executor:
+            results = executor.map(_scan_one, paths, repeat(root_dir), chunksize=8)
+            
+            for relative_path, path_counts, document_count, errors in results:
+                if errors:
+                    file_errors[relative_path] = errors
+                    print(f"❌ {relative_path}: {len(errors)} error(s)")
+                else:
+                    print(f"✅ {relative_path}: {document_count} document(s)")
+                
+                for path, count in path_counts.items():
+                    all_path_counts[path] += count
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+            gc.collect()
+    
+    return join_key_paths(all_path_counts), file_errors
 
 
 def write_key_counts(key_counts: Dict[str, int], output_file: str):
@@ -138,85 +428,247 @@ def write_key_counts(key_counts: Dict[str, int], output_file: str):
     # Sort by count (descending) then by key (ascending)
     sorted_items = sorted(key_counts.items(), key=lambda x: (-x[1], x[0]))
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for key, count in sorted_items:
-            f.write(f"{count}\t{key}\n")
+    # Build the whole file in memory and write it in one call
+    buffer = ''.join([f"{count}\t{key}\n" for key, count in sorted_items])
+    with open(output_file, 'wb') as f:
+        f.write(buffer.encode('utf-8'))
     
     print(f"\n✅ Wrote {len(sorted_items)} unique keys to {output_file}")
 
 
-def get_open_prs(github_token: str, repo: str) -> List[Dict]:
+def configure_session(github_token: str):
     """
-    Get all open pull requests for the repository.
+    Attach GitHub credentials and default headers to the shared session.
     """
-    if not github_token:
-        return []
-    
-    headers = {
+    _SESSION.headers.update({
         'Authorization': f'token {github_token}',
         'Accept': 'application/vnd.github.v3+json'
+    })
+
+
+def get_paginated(url: str, params: Optional[Dict] = None) -> List[Dict]:
+    """
+    GET a GitHub list endpoint and follow its Link header across all pages.
+    Raises on HTTP errors so callers can report them.
+    """
+    items = []
+    
+    while url:
+        response = _SESSION.get(url, params=params)
+        response.raise_for_status()
+        items.extend(json_loads(response.content))
+        
+        # The "next" URL already carries the query string
+        url = response.links.get('next', {}).get('url')
+        params = None
+    
+    return items
+
+
+GRAPHQL_URL = 'https://api.github.com/graphql'
+
+# Open PRs together with their first 100 changed files, 100 PRs per page
+OPEN_PRS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        title
+        headRefOid
+        headRepository { nameWithOwner }
+        files(first: 100) {
+          pageInfo { hasNextPage }
+          nodes { path changeType }
+        }
+      }
     }
+  }
+}
+"""
+
+
+def graphql_query(query: str, variables: Dict) -> Dict:
+    """
+    Run a GitHub GraphQL query and return its data.
+    Raises on HTTP errors and on errors reported in the response body.
+    """
+    response = _SESSION.post(GRAPHQL_URL, json={'query': query, 'variables': variables})
+    response.raise_for_status()
+    payload = json_loads(response.content)
+    
+    if payload.get('errors'):
+        raise RuntimeError(payload['errors'][0].get('message', 'GraphQL error'))
+    
+    return payload['data']
+
+
+def _pr_files_from_graphql(pr_node: Dict) -> List[Dict]:
+    """
+    Convert a PR's GraphQL file nodes to the shape of the REST files endpoint.
+    """
+    head_repo = pr_node.get('headRepository') or {}
+    head_sha = pr_node['headRefOid']
     
-    url = f'https://api.github.com/repos/{repo}/pulls'
-    params = {'state': 'open', 'per_page': 100}
+    pr_files = []
+    for file_node in pr_node['files']['nodes']:
+        path = file_node['path']
+        change_type = file_node['changeType']
+        
+        # Deleted head forks leave nowhere to download the contents from
+        raw_url = ''
+        if head_repo.get('nameWithOwner'):
+            raw_url = f"https://github.com/{head_repo['nameWithOwner']}/raw/{head_sha}/{quote(path)}"
+        
+        pr_files.append({
+            'filename': path,
+            'status': 'removed' if change_type == 'DELETED' else change_type.lower(),
+            'raw_url': raw_url,
+        })
+    
+    return pr_files
+
+
+def get_open_prs(repo: str) -> List[Dict]:
+    """
+    Get all open pull requests for the repository with a batched GraphQL query.
+    Each PR carries its changed files under 'files', or None when GraphQL
+    returned no file list or a truncated one, so they must be listed via REST.
+    """
+    owner, name = repo.split('/', 1)
+    variables = {'owner': owner, 'name': name, 'cursor': None}
+    prs = []
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.json()
+        while True:
+            data = graphql_query(OPEN_PRS_QUERY, variables)
+            pull_requests = data['repository']['pullRequests']
+            
+            for pr_node in pull_requests['nodes']:
+                # A null or truncated file list is left for the REST fallback
+                files = None
+                file_connection = pr_node.get('files')
+                if file_connection and not file_connection['pageInfo']['hasNextPage']:
+                    files = _pr_files_from_graphql(pr_node)
+                
+                prs.append({
+                    'number': pr_node['number'],
+                    'title': pr_node['title'],
+                    'head_sha': pr_node['headRefOid'],
+                    'files': files,
+                })
+            
+            if not pull_requests['pageInfo']['hasNextPage']:
+                return prs
+            variables['cursor'] = pull_requests['pageInfo']['endCursor']
     except Exception as e:
         print(f"⚠️  Error fetching PRs: {e}")
         return []
 
 
-def get_pr_files(github_token: str, repo: str, pr_number: int) -> List[Dict]:
+def get_pr_files(repo: str, pr_number: int) -> List[Dict]:
     """
     Get files changed in a pull request.
     """
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
     url = f'https://api.github.com/repos/{repo}/pulls/{pr_number}/files'
+    params = {'per_page': 100}
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return get_paginated(url, params)
     except Exception as e:
         print(f"⚠️  Error fetching PR files: {e}")
         return []
 
 
-def fetch_file_content(raw_url: str, github_token: str) -> str:
+def fetch_file_content(raw_url: str) -> bytes:
     """
     Fetch raw file content from GitHub.
     """
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3.raw'
-    }
-    
     try:
-        response = requests.get(raw_url, headers=headers)
+        response = _SESSION.get(raw_url, headers={'Accept': 'application/vnd.github.v3.raw'})
         response.raise_for_status()
-        return response.text
+        return response.content
     except Exception as e:
         print(f"⚠️  Error fetching file content: {e}")
-        return ""
+        return b""
 
 
-def analyze_pr_yaml_files(github_token: str, repo: str, pr_number: int) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+def fetch_pr_heads(pr_numbers: List[int]):
     """
-    Analyze YAML files changed in a PR.
-    Returns (pr_key_counts, pr_file_errors).
+    Fetch the head commits of the given PRs into the local repository with a
+    single git fetch, so their files can be read without the GitHub API.
+    """
+    if not pr_numbers:
+        return
+    
+    refspecs = [f'pull/{pr_number}/head' for pr_number in pr_numbers]
+    
+    try:
+        subprocess.run(
+            ['git', 'fetch', '--quiet', '--no-tags', 'origin', *refspecs],
+            capture_output=True,
+            check=True
+        )
+    except Exception as e:
+        print(f"⚠️  Could not fetch PR heads, file contents will be downloaded: {e}")
+
+
+def read_git_blobs(object_names: List[str]) -> Dict[str, bytes]:
+    """
+    Read many blobs (e.g. "<sha>:<path>") through one `git cat-file --batch`.
+    Returns a dict of object name to content; names git does not know are
+    left out so callers can fall back to downloading them.
     """
-    pr_files = get_pr_files(github_token, repo, pr_number)
+    # The batch protocol is line-based
+    object_names = [name for name in object_names if '\n' not in name]
+    if not object_names:
+        return {}
     
-    pr_key_counts = defaultdict(int)
+    try:
+        result = subprocess.run(
+            ['git', 'cat-file', '--batch'],
+            input=''.join(f'{name}\n' for name in object_names).encode('utf-8'),
+            capture_output=True,
+            check=True
+        )
+    except Exception as e:
+        print(f"⚠️  Could not read files from git: {e}")
+        return {}
+    
+    # Each record is "<oid> <type> <size>\n<content>\n" or "<name> missing\n"
+    output = result.stdout
+    blobs = {}
+    offset = 0
+    
+    for name in object_names:
+        header_end = output.index(b'\n', offset)
+        header = output[offset:header_end].split(b' ')
+        offset = header_end + 1
+        
+        if len(header) != 3 or not header[2].isdigit():
+            continue
+        
+        size = int(header[2])
+        if header[1] == b'blob':
+            blobs[name] = output[offset:offset + size]
+        offset += size + 1
+    
+    return blobs
+
+
+def analyze_pr_yaml_files(pr_files: List[Dict], head_sha: str = '') -> Tuple[DefaultDict[str, int], Dict[str, List[str]]]:
+    """
+    Analyze YAML files changed in a PR, given its changed files.
+    Contents are read from local git objects at `head_sha` when available,
+    falling back to downloading them from raw_url.
+    Returns (pr_key_counts, pr_file_errors).
+    """
+    pr_path_counts = defaultdict(int)
     pr_file_errors = {}
     
+    # Collect the files worth fetching before hitting the network
+    candidates = []
     for file_info in pr_files:
         filename = file_info['filename']
         
@@ -225,43 +677,63 @@ def analyze_pr_yaml_files(github_token: str, repo: str, pr_number: int) -> Tuple
             continue
         
         # Skip .github/workflows
-        if '.github/workflows' in filename:
+        if EXCLUDED_PATH_RE.search(filename):
             continue
         
         # Skip deleted files
         if file_info['status'] == 'removed':
             continue
         
-        # Fetch file content
-        raw_url = file_info.get('raw_url', '')
-        if not raw_url:
-            continue
-        
-        content = fetch_file_content(raw_url, github_token)
-        if not content:
-            pr_file_errors[filename] = ["Could not fetch file content"]
-            continue
+        candidates.append((filename, file_info.get('raw_url', '')))
+    
+    # Read as many files as possible from the local object database
+    local_contents = {}
+    if head_sha:
+        blobs = read_git_blobs([f'{head_sha}:{filename}' for filename, _ in candidates])
+        for filename, _ in candidates:
+            object_name = f'{head_sha}:{filename}'
+            if object_name in blobs:
+                local_contents[filename] = blobs[object_name]
+    
+    # Download the rest concurrently
+    downloads = [
+        (filename, raw_url) for filename, raw_url in candidates
+        if filename not in local_contents and raw_url
+    ]
+    with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+        downloaded = dict(executor.map(
+            lambda download: (download[0], fetch_file_content(download[1])),
+            downloads
+        ))
+    
+    # Process in the PR's file order
+    for filename, raw_url in candidates:
+        content = local_contents.get(filename)
+        if content is None:
+            if not raw_url:
+                continue
+            
+            content = downloaded[filename]
+            if not content:
+                pr_file_errors[filename] = ["Could not fetch file content"]
+                continue
         
         # Parse YAML
-        documents = []
-        errors = []
-        try:
-            for doc in yaml.safe_load_all(content):
-                if doc is not None:
-                    documents.append(doc)
-        except yaml.YAMLError as e:
-            errors.append(f"YAML parse error: {str(e)}")
-        
-        if errors:
-            pr_file_errors[filename] = errors
+        documents, errors = parse_yaml_content_cached(content)
         
         # Extract keys
+        self_references = 0
         for doc in documents:
-            key_counts = extract_keys(doc)
-            for key, count in key_counts.items():
-                pr_key_counts[key] += count
+            self_references += extract_keys_into(doc, pr_path_counts)
+        
+        if self_references:
+            # Cached error lists are shared, so build a new one
+            errors = errors + [SELF_REFERENCE_ERROR]
+        
+        if errors:
+            pr_file_errors[filename] = errors
     
-    return dict(pr_key_counts), pr_file_errors
+    return join_key_paths(pr_path_counts), pr_file_errors
 
 
 def build_pr_comment(
@@ -274,94 +746,118 @@ def build_pr_comment(
     Build a comment summarizing the PR's YAML validation and key impact.
     """
     lines = []
-    lines.append("## YAML Validation Report")
-    lines.append("")
+    add_line = lines.append
+    add_line(COMMENT_MARKER)
+    add_line("")
     
     # Validation results
     if pr_file_errors:
-        lines.append("### ❌ Validation Errors")
-        lines.append("")
+        add_line("### ❌ Validation Errors")
+        add_line("")
         for filename, errors in pr_file_errors.items():
-            lines.append(f"**{filename}**")
+            add_line(f"**{filename}**")
             for error in errors:
-                lines.append(f"- {error}")
-            lines.append("")
+                add_line(f"- {error}")
+            add_line("")
     else:
-        lines.append("### ✅ All YAML Files Valid")
-        lines.append("")
+        add_line("### ✅ All YAML Files Valid")
+        add_line("")
     
     # Key counts in PR
     if pr_key_counts:
-        lines.append("### 📊 Keys in This PR")
-        lines.append("")
-        lines.append(f"Total unique keys: {len(pr_key_counts)}")
-        lines.append("")
+        add_line("### 📊 Keys in This PR")
+        add_line("")
+        add_line(f"Total unique keys: {len(pr_key_counts)}")
+        add_line("")
         
         # Sort by count (descending) then key
         sorted_pr_keys = sorted(pr_key_counts.items(), key=lambda x: (-x[1], x[0]))
         
-        lines.append("<details>")
-        lines.append("<summary>View all keys (click to expand)</summary>")
-        lines.append("")
-        lines.append("| Key | Count in PR |")
-        lines.append("|-----|-------------|")
+        add_line("<details>")
+        add_line("<summary>View all keys (click to expand)</summary>")
+        add_line("")
+        add_line("| Key | Count in PR |")
+        add_line("|-----|-------------|")
         for key, count in sorted_pr_keys:
-            lines.append(f"| `{key}` | {count} |")
-        lines.append("")
-        lines.append("</details>")
-        lines.append("")
-        
-        # New keys and count increases
-        new_keys = []
-        increased_keys = []
-        
-        for key, pr_count in pr_key_counts.items():
-            repo_count = repo_key_counts.get(key, 0)
-            if repo_count == 0:
-                new_keys.append(key)
-            elif pr_count > 0:
-                new_total = repo_count + pr_count
-                increased_keys.append((key, repo_count, pr_count, new_total))
+            add_line(f"| `{key}` | {count} |")
+        add_line("")
+        add_line("</details>")
+        add_line("")
+        
+        # New keys and count increases, partitioned with set operations on
+        # the key views; counts are only looked up for the keys in each part
+        pr_keys = pr_key_counts.keys()
+        repo_keys = repo_key_counts.keys()
+        new_keys = pr_keys - repo_keys
+        increased_keys = pr_keys & repo_keys
         
         if new_keys:
-            lines.append("### 🆕 New Keys Introduced")
-            lines.append("")
+            add_line("### 🆕 New Keys Introduced")
+            add_line("")
             for key in sorted(new_keys):
                 pr_count = pr_key_counts[key]
-                lines.append(f"- `{key}` (count: {pr_count})")
-            lines.append("")
+                add_line(f"- `{key}` (count: {pr_count})")
+            add_line("")
         
         if increased_keys:
-            lines.append("### 📈 Keys with Increased Counts")
-            lines.append("")
-            lines.append("| Key | Repo Count | PR Count | New Total |")
-            lines.append("|-----|------------|----------|-----------|")
-            for key, repo_count, pr_count, new_total in sorted(increased_keys, key=lambda x: -x[2]):
-                lines.append(f"| `{key}` | {repo_count} | +{pr_count} | {new_total} |")
-            lines.append("")
+            add_line("### 📈 Keys with Increased Counts")
+            add_line("")
+            add_line("| Key | Repo Count | PR Count | New Total |")
+            add_line("|-----|------------|----------|-----------|")
+            # Sort by PR count (descending) then key
+            for key in sorted(increased_keys, key=lambda k: (-pr_key_counts[k], k)):
+                repo_count = repo_key_counts[key]
+                pr_count = pr_key_counts[key]
+                add_line(f"| `{key}` | {repo_count} | +{pr_count} | {repo_count + pr_count} |")
+            add_line("")
     
-    lines.append("---")
-    lines.append("*Generated by YAML validation workflow*")
+    add_line("---")
+    add_line("*Generated by YAML validation workflow*")
     
     return "\n".join(lines)
 
 
-def post_pr_comment(github_token: str, repo: str, pr_number: int, comment_body: str):
+def find_report_comment(repo: str, pr_number: int) -> Optional[Dict]:
     """
-    Post a comment on a pull request.
+    Find the most recent validation comment on a pull request, if any.
+    Only bot-authored comments count, so a contributor's comment that starts
+    with the same heading is never mistaken for (or overwritten as) the report.
     """
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
     url = f'https://api.github.com/repos/{repo}/issues/{pr_number}/comments'
+    
+    report_comment = None
+    for comment in get_paginated(url, {'per_page': 100}):
+        if (comment.get('user') or {}).get('type') != 'Bot':
+            continue
+        
+        if (comment.get('body') or '').startswith(COMMENT_MARKER):
+            report_comment = comment
+    
+    return report_comment
+
+
+def upsert_pr_comment(repo: str, pr_number: int, comment_body: str):
+    """
+    Post the validation comment on a pull request, or update the one left by
+    a previous run instead of adding another. Unchanged reports are skipped.
+    """
     data = {'body': comment_body}
     
     try:
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
-        print(f"✅ Posted comment on PR #{pr_number}")
+        existing = find_report_comment(repo, pr_number)
+        
+        if existing is None:
+            url = f'https://api.github.com/repos/{repo}/issues/{pr_number}/comments'
+            response = _SESSION.post(url, json=data)
+            response.raise_for_status()
+            print(f"✅ Posted comment on PR #{pr_number}")
+        elif existing['body'] == comment_body:
+            print(f"✅ Comment on PR #{pr_number} already up to date")
+        else:
+            url = f"https://api.github.com/repos/{repo}/issues/comments/{existing['id']}"
+            response = _SESSION.patch(url, json=data)
+            response.raise_for_status()
+            print(f"✅ Updated comment on PR #{pr_number}")
     except Exception as e:
         print(f"⚠️  Error posting comment on PR #{pr_number}: {e}")
 
@@ -369,6 +865,7 @@ def post_pr_comment(github_token: str, repo: str, pr_number: int, comment_body:
 def process_pull_requests(github_token: str, repo: str, repo_key_counts: Dict[str, int]):
     """
     Process all open PRs and post validation comments.
+    Reports are built for every PR first, then posted concurrently.
     """
     if not github_token:
         print("\n⚠️  GITHUB_TOKEN not provided, skipping PR comments")
@@ -378,24 +875,42 @@ def process_pull_requests(github_token: str, repo: str, repo_key_counts: Dict[st
         print("\n⚠️  Repository name not available, skipping PR comments")
         return
     
-    prs = get_open_prs(github_token, repo)
+    prs = get_open_prs(repo)
     print(f"\n📋 Found {len(prs)} open PR(s)")
     
+    fetch_pr_heads([pr['number'] for pr in prs])
+    
+    comments = []
     for pr in prs:
         pr_number = pr['number']
         pr_title = pr['title']
         print(f"\n🔍 Analyzing PR #{pr_number}: {pr_title}")
         
-        pr_key_counts, pr_file_errors = analyze_pr_yaml_files(github_token, repo, pr_number)
+        # Files only need a REST listing when the batched query truncated them
+        pr_files = pr['files']
+        if pr_files is None:
+            pr_files = get_pr_files(repo, pr_number)
+        
+        pr_key_counts, pr_file_errors = analyze_pr_yaml_files(pr_files, pr['head_sha'])
         
         comment = build_pr_comment(pr_number, pr_key_counts, repo_key_counts, pr_file_errors)
-        post_pr_comment(github_token, repo, pr_number, comment)
+        comments.append((pr_number, comment))
+    
+    if comments:
+        print(f"\n💬 Posting {len(comments)} comment(s)")
+    
+    with ThreadPoolExecutor(max_workers=MAX_COMMENT_WORKERS) as executor:
+        list(executor.map(lambda job: upsert_pr_comment(repo, *job), comments))
 
 
 def main():
     """
     Main execution function.
     """
+    # Cache entries touched before this point are unused by this run; allow
+    # for filesystems whose timestamps lag the clock slightly
+    started_at = time.time() - 1
+    
     # Get configuration
     github_token = os.environ.get('GITHUB_TOKEN', '')
     
@@ -403,8 +918,6 @@ def main():
     repo = os.environ.get('GITHUB_REPOSITORY', '')
     if not repo:
         try:
-            import subprocess
-            import re
             result = subprocess.run(
                 ['git', 'config', '--get', 'remote.origin.url'],
                 capture_output=True,
@@ -430,6 +943,9 @@ def main():
     print(f"GitHub Token: {'✅ Available' if github_token else '❌ Not available'}")
     print("="*80)
     
+    if github_token:
+        configure_session(github_token)
+    
     # Scan repository
     print("\n📂 Scanning repository for YAML files...")
     repo_key_counts, file_errors = scan_repository('.')
@@ -452,6 +968,8 @@ def main():
     # Process pull requests
     process_pull_requests(github_token, repo, repo_key_counts)
     
+    prune_parse_cache(started_at)
+    
     print("\n" + "="*80)
     print("✅ Script completed successfully")
     print("="*80)
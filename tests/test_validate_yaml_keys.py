@@ -0,0 +1,54 @@
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import validate_yaml_keys as vyk
+
+
+def extract(source):
+    out = defaultdict(int)
+    skipped = vyk.extract_keys_into(yaml.load(source, Loader=vyk.SafeLoader), out)
+    return dict(vyk.join_key_paths(out)), skipped
+
+
+def test_self_referencing_list_alias_terminates():
+    assert extract('a: &x [*x]') == ({'a': 1, 'a[]': 1}, 1)
+
+
+def test_self_referencing_dict_alias_terminates():
+    assert extract('a: &x {k: *x}') == ({'a': 1, 'a.k': 1}, 1)
+
+
+def test_shared_alias_is_counted_at_every_use():
+    key_counts, skipped = extract('base: &b {n: 1}\nx: *b\ny: [*b, *b]')
+    assert skipped == 0
+    assert key_counts['base.n'] == 1
+    assert key_counts['x.n'] == 1
+    assert key_counts['y.n'] == 2
+
+
+def test_self_reference_is_reported_for_pr_files(monkeypatch):
+    monkeypatch.setattr(vyk, 'fetch_file_content', lambda raw_url: b'a: &x [*x]\n')
+
+    key_counts, errors = vyk.analyze_pr_yaml_files([
+        {'filename': 'characters/loop.yaml', 'status': 'added', 'raw_url': 'https://example.invalid/loop.yaml'}
+    ])
+
+    assert errors == {'characters/loop.yaml': [vyk.SELF_REFERENCE_ERROR]}
+    assert key_counts == {'a': 1, 'a[]': 1}
+
+
+def test_parse_yaml_file_without_file_digest(monkeypatch, tmp_path):
+    yaml_file = tmp_path / 'character.yaml'
+    yaml_file.write_bytes(b'name: test\n')
+    with open(yaml_file, 'rb') as f:
+        expected = vyk._file_content_digest(f)
+
+    monkeypatch.delattr(vyk.hashlib, 'file_digest', raising=False)
+    with open(yaml_file, 'rb') as f:
+        assert vyk._file_content_digest(f) == expected
+    assert vyk.parse_yaml_file(yaml_file) == ([{'name': 'test'}], [])